@@ -10,6 +10,7 @@ Filters out non-cat images using multiple strategies:
 """
 
 import os
+import re
 import json
 import shutil
 import logging
@@ -68,8 +69,12 @@ class AdvancedDatasetCleaner:
             'spacer', 'pixel', 'transparent', 'blank', 'sample'
         ]
         
+        # Single alternation so each filename is scanned once, not once per pattern
+        self.non_cat_pattern_re = re.compile('|'.join(map(re.escape, self.non_cat_patterns)))
+        
         # Known non-cat file sizes (very small files that are likely icons)
         self.suspicious_sizes = [43, 172, 281, 364, 883, 1300, 1500, 1900, 3400, 4000, 4058, 4500, 5200, 5871, 6300, 6400, 6490, 6700, 6900, 7200]
+        self.suspicious_size_set = frozenset(self.suspicious_sizes)
         
         # File extensions to process
         self.image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff'}
@@ -86,12 +91,12 @@ class AdvancedDatasetCleaner:
 
     def is_suspicious_file_size(self, file_size):
         """Check if file size is suspiciously small (likely an icon)"""
-        return file_size in self.suspicious_sizes or file_size < self.min_file_size
+        return file_size in self.suspicious_size_set or file_size < self.min_file_size
 
     def is_suspicious_filename(self, filename):
         """Check if filename suggests it's not a cat image"""
         filename_lower = filename.lower()
-        return any(pattern in filename_lower for pattern in self.non_cat_patterns)
+        return self.non_cat_pattern_re.search(filename_lower) is not None
 
     def analyze_image_dimensions(self, image_path):
         """Analyze image dimensions and return if it's likely a cat image"""
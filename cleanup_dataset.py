@@ -24,6 +24,24 @@ logging.basicConfig(
     ]
 )
 
+# Filename patterns that suggest non-cat content
+NON_CAT_FILENAME_PATTERNS = (
+    'ad', 'advertisement', 'banner', 'logo', 'icon', 'button',
+    'thumb', 'thumbnail', 'preview', 'placeholder', 'dummy',
+    'loading', 'error', '404', 'noimage', 'default',
+    'illustration', 'drawing', 'cartoon', 'anime', 'manga',
+    'graphic', 'design', 'art', 'painting'
+)
+
+# Filename patterns that suggest cat content
+CAT_FILENAME_PATTERNS = (
+    'cat', 'foster', 'pet', 'animal', 'kitten', 'kitty'
+)
+
+# Each pattern list as one alternation, so a filename is scanned once per list
+NON_CAT_FILENAME_RE = re.compile('|'.join(map(re.escape, NON_CAT_FILENAME_PATTERNS)))
+CAT_FILENAME_RE = re.compile('|'.join(map(re.escape, CAT_FILENAME_PATTERNS)))
+
 class DatasetCleanup:
     def __init__(self, scraped_dir="scraped_cats"):
         self.scraped_dir = Path(scraped_dir)
@@ -72,14 +90,10 @@ class DatasetCleanup:
         except Exception:
             return False
     
-    def analyze_image_content(self, image_path):
+    def analyze_image_content(self, image_path, min_score=None):
         """Analyze image to determine if it's likely a cat"""
         try:
             with Image.open(image_path) as img:
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
                 # Get image properties
                 width, height = img.size
                 aspect_ratio = width / height if height > 0 else 0
@@ -99,6 +113,16 @@ class DatasetCleanup:
                 if width <= 5000 and height <= 5000:
                     cat_indicators += 1
                 
+                # The color check adds at most one point; when the caller only
+                # needs to know whether min_score is reached and the dimension
+                # checks already decide that, skip the full decode it requires
+                if min_score is not None and (cat_indicators >= min_score or cat_indicators + 1 < min_score):
+                    return cat_indicators
+                
+                # Convert to RGB if necessary
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                
                 # Get dominant colors (cats often have warm colors)
                 try:
                     # Resize for faster processing
@@ -132,27 +156,11 @@ class DatasetCleanup:
         """Check filename for patterns that suggest non-cat content"""
         filename_lower = filename.lower()
         
-        # Patterns that suggest non-cat content
-        non_cat_patterns = [
-            'ad', 'advertisement', 'banner', 'logo', 'icon', 'button',
-            'thumb', 'thumbnail', 'preview', 'placeholder', 'dummy',
-            'loading', 'error', '404', 'noimage', 'default',
-            'illustration', 'drawing', 'cartoon', 'anime', 'manga',
-            'graphic', 'design', 'art', 'painting'
-        ]
-        
-        for pattern in non_cat_patterns:
-            if pattern in filename_lower:
-                return False
-        
-        # Patterns that suggest cat content
-        cat_patterns = [
-            'cat', 'foster', 'pet', 'animal', 'kitten', 'kitty'
-        ]
+        if NON_CAT_FILENAME_RE.search(filename_lower):
+            return False
         
-        for pattern in cat_patterns:
-            if pattern in filename_lower:
-                return True
+        if CAT_FILENAME_RE.search(filename_lower):
+            return True
         
         return None  # No clear indication
     
@@ -174,8 +182,8 @@ class DatasetCleanup:
             logging.info(f"Keeping cat image (filename): {filename}")
             return True
         
-        # Analyze image content
-        cat_score = self.analyze_image_content(image_path)
+        # Analyze image content (scores of 2 and above are kept either way)
+        cat_score = self.analyze_image_content(image_path, min_score=2)
         
         # Decision logic
         if cat_score >= 3:
@@ -6,15 +6,20 @@ Uses the discovered API endpoint to scrape all available cats
 
 import os
 import json
-import time
-import random
+import shutil
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
+import soupsieve
 import logging
 from datetime import datetime
 import re
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from scraper_utils import HostRateLimiter, is_cached, link_image
 
 # Configure logging
 logging.basicConfig(
@@ -26,9 +31,37 @@ logging.basicConfig(
     ]
 )
 
+# BeautifulSoup tree builder used for every page
+HTML_PARSER = 'lxml'
+
+# Image URLs worth keeping: cat/foster paths or a known photo extension
+IMAGE_URL_PATTERN = re.compile(r'cat|foster|\.(?:jpg|jpeg|png|webp)', re.IGNORECASE)
+
+# Containers and src patterns that hold profile images, compiled once so the
+# CSS isn't re-parsed for every profile page
+IMAGE_SELECTOR = soupsieve.compile(', '.join([
+    'img[src*="cat"]',
+    'img[src*="foster"]',
+    '.cat-image img',
+    '.profile-image img',
+    '.gallery img',
+    '.photo img',
+    'img[src*=".jpg"]',
+    'img[src*=".jpeg"]',
+    'img[src*=".png"]',
+    'img[src*=".webp"]'
+]))
+
 class ComprehensiveCatScraper:
-    def __init__(self, base_url="https://neko-jirushi.com"):
+    def __init__(self, base_url="https://neko-jirushi.com", max_workers=4, requests_per_second=2, page_cache=None):
         self.base_url = base_url
+        self.base_origin = '{0.scheme}://{0.netloc}'.format(urlparse(base_url))
+        self.max_workers = max_workers  # Cat profiles scraped concurrently per page
+        self.image_workers = 4          # Images downloaded concurrently per cat
+        
+        # Politeness: every request from every worker shares one budget, so
+        # skipped cats and failed lookups don't pay a fixed sleep
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst=max_workers)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -41,6 +74,39 @@ class ComprehensiveCatScraper:
             'Referer': 'https://neko-jirushi.com/foster/cat/contents/?p=1'
         })
         
+        # Keep one pooled keep-alive connection per concurrent download and retry
+        # transient failures (429/5xx) with exponential backoff; the API POST is
+        # a read-only search, so it is safe to retry as well
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=('GET', 'HEAD', 'POST'),
+            respect_retry_after_header=True
+        )
+        pool_size = self.max_workers * self.image_workers
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Profile pages can be served from an on-disk cache (e.g. 'neko_cache.sqlite')
+        # so development re-runs don't refetch them; the API and images always use
+        # self.session. Server Cache-Control headers take precedence over the one-day
+        # default, and stale entries are revalidated with a conditional GET.
+        self.page_session = self.session
+        if page_cache:
+            import requests_cache
+            self.page_session = requests_cache.CachedSession(
+                page_cache,
+                backend='sqlite',
+                expire_after=86400,
+                allowable_methods=('GET',),
+                cache_control=True
+            )
+            self.page_session.headers.update(self.session.headers)
+            self.page_session.mount('https://', adapter)
+            self.page_session.mount('http://', adapter)
+        
         # Create directories
         self.data_dir = Path("scraped_cats")
         self.data_dir.mkdir(exist_ok=True)
@@ -54,10 +120,17 @@ class ComprehensiveCatScraper:
         self.stats = {
             'total_cats_found': 0,
             'total_images_downloaded': 0,
+            'total_images_reused': 0,
             'pages_scraped': 0,
             'errors': 0,
             'start_time': datetime.now().isoformat()
         }
+        self.stats_lock = threading.Lock()  # Guards stats updated from worker threads
+        
+        # Image URL -> file it was saved to this run; site-wide images that match
+        # on many profiles are fetched once and hard-linked into later cats
+        self.downloaded_images = {}
+        self.downloaded_images_lock = threading.Lock()
 
     def load_progress(self):
         """Load progress from file"""
@@ -88,14 +161,21 @@ class ComprehensiveCatScraper:
             'failed_pages': list(self.progress['failed_pages'])
         }
         
+        # Both files are rewritten after every page, so write them compactly
         with open(self.progress_file, 'w', encoding='utf-8') as f:
-            json.dump(progress_to_save, f, indent=2, ensure_ascii=False)
+            json.dump(progress_to_save, f, ensure_ascii=False, separators=(',', ':'))
         
         # Save discovered cats
         with open(self.discovered_cats_file, 'w', encoding='utf-8') as f:
-            json.dump(self.discovered_cats, f, indent=2, ensure_ascii=False)
+            json.dump(self.discovered_cats, f, ensure_ascii=False, separators=(',', ':'))
 
-    def get_api_page(self, page_num, retries=3):
+    def absolute_url(self, href):
+        """Resolve a link against base_url, skipping urljoin for root-relative paths"""
+        if href.startswith('/') and not href.startswith('//'):
+            return self.base_origin + href
+        return urljoin(self.base_url, href)
+
+    def get_api_page(self, page_num):
         """Get cat data from API endpoint"""
         api_url = f"{self.base_url}/foster/ajax/ajax_getFosterList.php"
         
@@ -123,21 +203,18 @@ class ComprehensiveCatScraper:
             'spMode': 0
         }
         
-        for attempt in range(retries):
-            try:
-                response = self.session.post(api_url, data=data, timeout=30)
-                response.raise_for_status()
-                return response.json()
-            except requests.RequestException as e:
-                logging.warning(f"Attempt {attempt + 1} failed for page {page_num}: {e}")
-                if attempt < retries - 1:
-                    time.sleep(random.uniform(2, 5))
-                else:
-                    logging.error(f"Failed to get page {page_num} after {retries} attempts")
-                    return None
-            except json.JSONDecodeError as e:
-                logging.error(f"JSON decode error for page {page_num}: {e}")
-                return None
+        # Transient failures are retried with backoff by the session's adapter
+        try:
+            self.rate_limiter.acquire(api_url)
+            response = self.session.post(api_url, data=data, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            logging.error(f"Failed to get page {page_num}: {e}")
+            return None
+        except json.JSONDecodeError as e:
+            logging.error(f"JSON decode error for page {page_num}: {e}")
+            return None
 
     def scrape_cat_profile(self, cat_info):
         """Scrape individual cat profile for images"""
@@ -148,54 +225,42 @@ class ComprehensiveCatScraper:
         logging.info(f"Scraping cat profile: {cat_info['catch_copy']} ({cat_info['cat_id']})")
         
         # Construct the cat URL
-        cat_url = urljoin(self.base_url, cat_info['url'])
+        cat_url = self.absolute_url(cat_info['url'])
         
-        response = self.session.get(cat_url, timeout=30)
+        # Pages served from the cache don't touch the server, so they skip the wait
+        if not is_cached(self.page_session, cat_url):
+            self.rate_limiter.acquire(cat_url)
+        response = self.page_session.get(cat_url, timeout=30)
         if not response:
             return
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, HTML_PARSER)
         
         # Find all images on the page
         images = []
+        seen_urls = set()  # O(1) duplicate checks instead of rescanning images
         
-        # Look for images in various containers
-        image_selectors = [
-            'img[src*="cat"]',
-            'img[src*="foster"]',
-            '.cat-image img',
-            '.profile-image img',
-            '.gallery img',
-            '.photo img',
-            'img[src*=".jpg"]',
-            'img[src*=".jpeg"]',
-            'img[src*=".png"]',
-            'img[src*=".webp"]'
-        ]
-        
-        for selector in image_selectors:
-            found_images = soup.select(selector)
-            for img in found_images:
-                src = img.get('src') or img.get('data-src')
-                if src:
-                    if not src.startswith('http'):
-                        src = urljoin(self.base_url, src)
-                    
-                    # Filter out small images, icons, and non-cat images
-                    if (src not in [img['url'] for img in images] and
-                        ('cat' in src.lower() or 'foster' in src.lower() or
-                         any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']))):
-                        
-                        images.append({
-                            'url': src,
-                            'alt': img.get('alt', ''),
-                            'title': img.get('title', '')
-                        })
+        # Look for images in various containers; one combined selector walks
+        # the tree once instead of once per selector
+        for img in IMAGE_SELECTOR.select(soup):
+            src = img.get('src') or img.get('data-src')
+            if src:
+                if not src.startswith('http'):
+                    src = self.absolute_url(src)
+                
+                # Filter out small images, icons, and non-cat images
+                if src not in seen_urls and IMAGE_URL_PATTERN.search(src):
+                    seen_urls.add(src)
+                    images.append({
+                        'url': src,
+                        'alt': img.get('alt', ''),
+                        'title': img.get('title', '')
+                    })
         
         # Also add the main image from the API response
         if cat_info.get('image_1'):
-            main_image_url = urljoin(self.base_url, cat_info['image_1'])
-            if main_image_url not in [img['url'] for img in images]:
+            main_image_url = self.absolute_url(cat_info['image_1'])
+            if main_image_url not in seen_urls:
                 images.insert(0, {
                     'url': main_image_url,
                     'alt': cat_info.get('catch_copy', ''),
@@ -221,46 +286,87 @@ class ComprehensiveCatScraper:
             with open(cat_dir / 'info.json', 'w', encoding='utf-8') as f:
                 json.dump(cat_data, f, indent=2, ensure_ascii=False)
             
-            # Download images
-            downloaded_count = 0
-            for i, img in enumerate(images):
-                try:
-                    img_response = self.session.get(img['url'], timeout=30)
-                    img_response.raise_for_status()
-                    
-                    # Determine file extension
-                    content_type = img_response.headers.get('content-type', '')
-                    if 'jpeg' in content_type or 'jpg' in content_type:
-                        ext = '.jpg'
-                    elif 'png' in content_type:
-                        ext = '.png'
-                    elif 'webp' in content_type:
-                        ext = '.webp'
-                    else:
-                        ext = '.jpg'  # default
-                    
-                    img_filename = f"image_{i+1}{ext}"
-                    img_path = cat_dir / img_filename
-                    
-                    with open(img_path, 'wb') as f:
-                        f.write(img_response.content)
-                    
-                    downloaded_count += 1
-                    self.stats['total_images_downloaded'] += 1
-                    
-                    # Random delay between image downloads
-                    time.sleep(random.uniform(0.5, 1.5))
-                    
-                except Exception as e:
-                    logging.error(f"Failed to download image {img['url']}: {e}")
+            # Skip images an interrupted earlier run already saved; the extension
+            # comes from Content-Type, so match on the numbered stem. download_image
+            # only renames complete files to image_<n>, so anything still named
+            # .part was cut off and is discarded and fetched again
+            saved_stems = set()
+            for name in os.listdir(cat_dir):
+                if name.endswith('.part'):
+                    (cat_dir / name).unlink(missing_ok=True)
+                else:
+                    saved_stems.add(os.path.splitext(name)[0])
+            pending = [(number, img) for number, img in enumerate(images, 1)
+                       if f"image_{number}" not in saved_stems]
+            if len(pending) < len(images):
+                logging.info(f"Cat {cat_info['cat_id']} already has {len(images) - len(pending)} images on disk")
+            
+            # Download images concurrently; each worker still paces itself
+            with ThreadPoolExecutor(max_workers=self.image_workers) as executor:
+                results = executor.map(
+                    lambda job: self.download_image(job[1], cat_dir, job[0]), pending
+                )
+                downloaded_count = sum(results)
             
-            logging.info(f"Downloaded {downloaded_count} images for cat {cat_info['cat_id']}")
+            logging.info(f"Saved {downloaded_count} images for cat {cat_info['cat_id']}")
             self.progress['scraped_cats'].add(str(cat_info['cat_id']))
-            self.stats['total_cats_found'] += 1
+            with self.stats_lock:
+                self.stats['total_cats_found'] += 1
             
         else:
             logging.warning(f"No images found for cat {cat_info['cat_id']}")
 
+    def download_image(self, img, cat_dir, number):
+        """Download one profile image, returning True on success"""
+        with self.downloaded_images_lock:
+            existing_path = self.downloaded_images.get(img['url'])
+        if existing_path and link_image(existing_path, cat_dir / f"image_{number}{existing_path.suffix}"):
+            with self.stats_lock:
+                self.stats['total_images_reused'] += 1
+            return True
+        
+        part_path = None
+        try:
+            self.rate_limiter.acquire(img['url'])
+            with self.session.get(img['url'], timeout=30, stream=True) as img_response:
+                img_response.raise_for_status()
+                
+                # Determine file extension
+                content_type = img_response.headers.get('content-type', '')
+                if 'jpeg' in content_type or 'jpg' in content_type:
+                    ext = '.jpg'
+                elif 'png' in content_type:
+                    ext = '.png'
+                elif 'webp' in content_type:
+                    ext = '.webp'
+                else:
+                    ext = '.jpg'  # default
+                
+                img_filename = f"image_{number}{ext}"
+                img_path = cat_dir / img_filename
+                
+                # Stream to disk in 64KB chunks instead of buffering the whole image,
+                # under a temporary name that is renamed into place only once the
+                # whole body has arrived, so a failed transfer never leaves a
+                # truncated image that a resumed run would take as complete
+                part_path = img_path.with_name(img_filename + '.part')
+                img_response.raw.decode_content = True
+                with open(part_path, 'wb') as f:
+                    shutil.copyfileobj(img_response.raw, f, length=65536)
+                os.replace(part_path, img_path)
+            
+            with self.downloaded_images_lock:
+                self.downloaded_images[img['url']] = img_path
+            with self.stats_lock:
+                self.stats['total_images_downloaded'] += 1
+            return True
+            
+        except Exception as e:
+            logging.error(f"Failed to download image {img['url']}: {e}")
+            if part_path:
+                part_path.unlink(missing_ok=True)
+            return False
+
     def scrape_api_page(self, page_num):
         """Scrape a single API page"""
         logging.info(f"Scraping API page {page_num}")
@@ -298,6 +404,10 @@ class ComprehensiveCatScraper:
         if max_pages is None:
             max_pages = min(1000, (target_cats // 22) + 10)  # 22 cats per page
         
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        queued_cat_ids = set()  # Cats already handed to a worker this run
+        interrupted = False
+        
         for page_num in range(start_page, start_page + max_pages):
             try:
                 cats_on_page = self.scrape_api_page(page_num)
@@ -306,29 +416,29 @@ class ComprehensiveCatScraper:
                     logging.warning(f"No cats found on page {page_num}, stopping")
                     break
                 
-                # Scrape each cat's profile
+                # Drop cats that are already done or that repeat from an earlier page
+                # (the listing shifts as new cats are posted) before any fetch
+                new_cats = []
                 for cat_info in cats_on_page:
+                    cat_id = str(cat_info['cat_id'])
+                    if cat_id not in queued_cat_ids and cat_id not in self.progress['scraped_cats']:
+                        queued_cat_ids.add(cat_id)
+                        new_cats.append(cat_info)
+                if len(new_cats) < len(cats_on_page):
+                    logging.info(f"Skipping {len(cats_on_page) - len(new_cats)} already seen cats on page {page_num}")
+                
+                # Scrape the page's cat profiles concurrently
+                futures = {executor.submit(self.scrape_cat_profile, cat_info): cat_info for cat_info in new_cats}
+                for future in as_completed(futures):
                     try:
-                        self.scrape_cat_profile(cat_info)
+                        future.result()
                     except Exception as e:
-                        logging.error(f"Error scraping cat {cat_info.get('cat_id', 'unknown')}: {e}")
-                        continue
-                    
-                    # Save progress periodically
-                    if len(self.progress['scraped_cats']) % 10 == 0:
-                        self.save_progress()
-                        self.print_stats()
-                
-                # Save progress after each page
-                self.save_progress()
+                        logging.error(f"Error scraping cat {futures[future].get('cat_id', 'unknown')}: {e}")
                 
+                # Save progress after each page, once no worker is still adding to it
                 self.progress['last_page'] = page_num
                 self.save_progress()
-                
-                # Random delay between pages
-                delay = random.uniform(3, 7)
-                logging.info(f"Waiting {delay:.1f} seconds before next page...")
-                time.sleep(delay)
+                self.print_stats()
                 
                 # Check if we've reached our target
                 if self.stats['total_cats_found'] >= target_cats:
@@ -337,12 +447,16 @@ class ComprehensiveCatScraper:
                 
             except KeyboardInterrupt:
                 logging.info("Scraping interrupted by user")
+                interrupted = True
                 break
             except Exception as e:
                 logging.error(f"Error on page {page_num}: {e}")
                 self.stats['errors'] += 1
                 continue
         
+        # On Ctrl-C, drop the queued cats that haven't started instead of
+        # scraping the rest of the page first; running ones still finish
+        executor.shutdown(wait=True, cancel_futures=interrupted)
         self.save_progress()
         self.print_final_stats()
 
@@ -351,6 +465,7 @@ class ComprehensiveCatScraper:
         logging.info(f"=== Current Stats ===")
         logging.info(f"Total cats found: {self.stats['total_cats_found']}")
         logging.info(f"Total images downloaded: {self.stats['total_images_downloaded']}")
+        logging.info(f"Total images reused: {self.stats['total_images_reused']}")
         logging.info(f"Pages scraped: {self.stats['pages_scraped']}")
         logging.info(f"Errors: {self.stats['errors']}")
         logging.info(f"Scraped cats: {len(self.progress['scraped_cats'])}")
@@ -366,6 +481,7 @@ class ComprehensiveCatScraper:
         logging.info(f"Scraping completed in: {duration}")
         logging.info(f"Total cats found: {self.stats['total_cats_found']}")
         logging.info(f"Total images downloaded: {self.stats['total_images_downloaded']}")
+        logging.info(f"Total images reused: {self.stats['total_images_reused']}")
         logging.info(f"Pages scraped: {self.stats['pages_scraped']}")
         logging.info(f"Errors encountered: {self.stats['errors']}")
         logging.info(f"Unique cats discovered: {len(self.discovered_cats)}")
@@ -378,10 +494,16 @@ def main():
     parser = argparse.ArgumentParser(description="Comprehensive cat scraper")
     parser.add_argument("--target", type=int, default=100, help="Target number of cats to scrape")
     parser.add_argument("--max-pages", type=int, default=50, help="Maximum number of pages to scrape")
+    parser.add_argument("--workers", type=int, default=4, help="Cat profiles to scrape concurrently")
+    parser.add_argument("--rate", type=float, default=2, help="Maximum requests per second")
+    parser.add_argument("--page-cache", help="SQLite file to cache profile pages in between runs")
     
     args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be greater than 0")
     
-    scraper = ComprehensiveCatScraper()
+    scraper = ComprehensiveCatScraper(max_workers=args.workers, requests_per_second=args.rate,
+                                      page_cache=args.page_cache)
     
     try:
         scraper.run_comprehensive_scrape(target_cats=args.target, max_pages=args.max_pages)
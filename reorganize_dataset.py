@@ -21,6 +21,10 @@ logging.basicConfig(
     ]
 )
 
+# Filename cleanup patterns
+UNSAFE_CHARS_PATTERN = re.compile(r'[^\w\s-]')
+SEPARATOR_PATTERN = re.compile(r'[-\s]+')
+
 class DatasetReorganizer:
     def __init__(self, scraped_dir="scraped_cats", output_dir="siamese_dataset"):
         self.scraped_dir = Path(scraped_dir)
@@ -59,8 +63,8 @@ class DatasetReorganizer:
     def clean_filename(self, name):
         """Clean filename for safe directory naming"""
         # Remove special characters and spaces
-        cleaned = re.sub(r'[^\w\s-]', '', name)
-        cleaned = re.sub(r'[-\s]+', '_', cleaned)
+        cleaned = UNSAFE_CHARS_PATTERN.sub('', name)
+        cleaned = SEPARATOR_PATTERN.sub('_', cleaned)
         cleaned = cleaned.strip('_')
         
         # Limit length
@@ -174,17 +178,22 @@ class DatasetReorganizer:
         
         logging.info(f"Found {len(cat_dirs)} cat_XXXXXX directories")
         
-        processed_cats = []
-        for cat_dir in cat_dirs:
-            result = self.process_cat_directory(cat_dir)
-            if result:
-                processed_cats.append(result)
+        # Stream one JSON record per processed cat (NDJSON) instead of
+        # holding every result in memory until the end
+        cats_file = self.output_dir / "reorganization_cats.ndjson"
+        processed_count = 0
+        with open(cats_file, 'w', encoding='utf-8') as f:
+            for cat_dir in cat_dirs:
+                result = self.process_cat_directory(cat_dir)
+                if result:
+                    f.write(json.dumps(result, ensure_ascii=False) + '\n')
+                    processed_count += 1
         
         # Process data/images structure
         self.process_data_images_structure()
         
         # Create summary
-        total_cats = len(list(self.output_dir.iterdir()))
+        total_cats = sum(1 for d in self.output_dir.iterdir() if d.is_dir())
         total_images = sum(len(list(d.glob("image_*"))) for d in self.output_dir.iterdir() if d.is_dir())
         
         logging.info(f"Reorganization complete!")
@@ -195,7 +204,8 @@ class DatasetReorganizer:
         summary = {
             'total_cats': total_cats,
             'total_images': total_images,
-            'processed_cats': processed_cats
+            'processed_cats_count': processed_count,
+            'processed_cats_file': cats_file.name
         }
         
         with open(self.output_dir / "reorganization_summary.json", 'w', encoding='utf-8') as f:
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Scraper Utilities
+Helpers shared by the neko-jirushi scrapers
+"""
+
+import os
+import time
+import shutil
+import logging
+import threading
+import requests
+from urllib.parse import urlparse
+
+class HostRateLimiter:
+    """Thread-safe token bucket per host, shared by all fetching workers"""
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError(f"rate must be greater than 0, got {rate}")
+        self.rate = rate    # Tokens (requests) added per second
+        self.burst = burst  # Maximum tokens a host can accumulate
+        self.buckets = {}   # host -> (tokens, last refill time)
+        self.lock = threading.Lock()
+    
+    def acquire(self, url):
+        """Block until a request to url's host is allowed"""
+        host = urlparse(url).netloc
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                tokens, last = self.buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                if tokens >= 1:
+                    self.buckets[host] = (tokens - 1, now)
+                    return
+                self.buckets[host] = (tokens, now)
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+def is_cached(session, url):
+    """True if a requests_cache session can answer a GET for url without a request"""
+    cache = getattr(session, 'cache', None)
+    if cache is None:
+        return False
+    # Expired entries still go to the network (to be revalidated), so they count as misses
+    response = cache.get_response(cache.create_key(requests.Request('GET', url)))
+    return response is not None and not response.is_expired
+
+
+def link_image(existing_path, path):
+    """Reuse an image already saved this run at path, returning True on success"""
+    try:
+        try:
+            os.link(existing_path, path)
+        except OSError:
+            # Different filesystem, or links unsupported: fall back to a copy
+            shutil.copyfile(existing_path, path)
+        return True
+    except OSError as e:
+        logging.warning(f"Failed to reuse image {existing_path}, downloading it again: {e}")
+        return False
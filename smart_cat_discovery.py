@@ -6,15 +6,21 @@ Finds new cats by exploring individual cat profile pages and related links
 
 import os
 import json
-import time
-import random
+import sqlite3
+import shutil
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 import logging
 from datetime import datetime
 import re
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from scraper_utils import HostRateLimiter, is_cached, link_image
 
 # Configure logging
 logging.basicConfig(
@@ -26,20 +32,97 @@ logging.basicConfig(
     ]
 )
 
+# BeautifulSoup tree builder used for every page
+HTML_PARSER = 'lxml'
+
+# Patterns compiled once and shared by every page
+FOSTER_URL_PATTERN = re.compile(r'/foster/(\d+)/')
+IMAGE_SRC_PATTERN = re.compile(r'\.(jpg|jpeg|png|gif)')
+NAME_CLASS_PATTERN = re.compile(r'title|name')
+DESCRIPTION_CLASS_PATTERN = re.compile(r'description|desc|content')
+DETAIL_CLASS_PATTERN = re.compile(r'detail|info|attribute')
+
+# Tags each profile field can come from; extract_cat_info visits their union once
+NAME_TAGS = frozenset(('h1', 'h2', 'h3'))
+DESCRIPTION_TAGS = frozenset(('div', 'p'))
+DETAIL_TAGS = frozenset(('div', 'span'))
+PROFILE_TAGS = list(NAME_TAGS | DESCRIPTION_TAGS | DETAIL_TAGS)
+
+# Extensions kept as-is when naming downloaded images; anything else is saved as .jpg
+IMAGE_EXTENSIONS = frozenset(('jpg', 'jpeg', 'png', 'gif'))
+
+# Progress sets, each persisted as a single-column SQLite table
+PROGRESS_TABLES = ('scraped_cats', 'discovered_urls', 'failed_urls')
+
+# Foster profile links, matched inside libxml2 so link exploration never walks
+# unrelated anchors in Python
+FOSTER_LINK_XPATH = '//a[re:test(@href, "/foster/[0-9]+/")]/@href'
+XPATH_NAMESPACES = {'re': 'http://exslt.org/regular-expressions'}
+
 class SmartCatDiscovery:
-    def __init__(self, base_url="https://neko-jirushi.com", target_cats=100):
+    def __init__(self, base_url="https://neko-jirushi.com", target_cats=100, max_workers=4, page_cache=None,
+                 requests_per_second=2):
         self.base_url = base_url
+        self.base_origin = '{0.scheme}://{0.netloc}'.format(urlparse(base_url))
         self.target_cats = target_cats
+        self.max_workers = max_workers  # Profiles fetched concurrently
+        self.image_workers = 8          # Images fetched concurrently per cat
+        
+        # Politeness: page and image fetches from all workers share one per-host budget
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst=max_workers)
+        
+        # Photos shared between profiles are fetched once; publish_cat_dir keeps
+        # these paths pointing at the published directories
+        self.downloaded_images = {}
+        self.downloaded_images_lock = threading.Lock()
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
+        # Size the connection pool for profile x image concurrency and retry
+        # transient failures (429/5xx) with exponential backoff
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=('GET', 'HEAD'),
+            respect_retry_after_header=True
+        )
+        pool_size = self.max_workers * self.image_workers
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        
+        # HTML pages can be served from an on-disk cache (e.g. 'neko_cache.sqlite')
+        # so development re-runs don't refetch them; images always use self.session.
+        # Server Cache-Control headers take precedence over the one-day default, and
+        # expired entries with an ETag/Last-Modified are revalidated with a
+        # conditional GET (a 304 reuses the cached body).
+        self.page_session = self.session
+        if page_cache:
+            import requests_cache
+            self.page_session = requests_cache.CachedSession(
+                page_cache,
+                backend='sqlite',
+                expire_after=86400,
+                allowable_methods=('GET',),
+                cache_control=True
+            )
+            self.page_session.headers.update(self.session.headers)
+            self.page_session.mount('https://', self.adapter)
+            self.page_session.mount('http://', self.adapter)
+        
         # Progress tracking
-        self.progress_file = 'smart_discovery_progress.json'
+        self.progress_db_file = 'smart_discovery_progress.db'
+        self.progress_file = 'smart_discovery_progress.json'  # Legacy, imported once
         self.scraped_cats = set()
         self.discovered_urls = set()
         self.failed_urls = set()
+        self.saved_progress = {table: set() for table in PROGRESS_TABLES}
+        self.progress_lock = threading.Lock()  # Guards the progress sets updated from worker threads
+        self.confirmed_urls = set()  # Seen in the API or page links this run; scraped before guesses
         
         # Create directories
         self.output_dir = Path('scraped_cats')
@@ -47,28 +130,68 @@ class SmartCatDiscovery:
         
         self.load_progress()
     
+    def open_progress_db(self):
+        """Open the SQLite progress database in WAL mode"""
+        self.db = sqlite3.connect(self.progress_db_file)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        with self.db:
+            for table in PROGRESS_TABLES:
+                self.db.execute(f'CREATE TABLE IF NOT EXISTS {table} (value TEXT PRIMARY KEY)')
+            self.db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+    
     def load_progress(self):
-        """Load progress from file"""
-        if os.path.exists(self.progress_file):
+        """Load progress from the database (importing the old JSON file once)"""
+        self.open_progress_db()
+        
+        for table in PROGRESS_TABLES:
+            values = {row[0] for row in self.db.execute(f'SELECT value FROM {table}')}
+            setattr(self, table, values)
+            self.saved_progress[table] = set(values)
+        
+        if self.scraped_cats or self.discovered_urls or self.failed_urls:
+            logging.info(f"Loaded progress: {len(self.scraped_cats)} cats scraped, {len(self.discovered_urls)} URLs discovered")
+        elif os.path.exists(self.progress_file):
             with open(self.progress_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             self.scraped_cats = set(data.get('scraped_cats', []))
-            self.discovered_urls = set(data.get('discovered_urls', []))
-            self.failed_urls = set(data.get('failed_urls', []))
-            logging.info(f"Loaded progress: {len(self.scraped_cats)} cats scraped, {len(self.discovered_urls)} URLs discovered")
+            self.discovered_urls = {self.canonical_cat_url(url) for url in data.get('discovered_urls', [])}
+            self.failed_urls = {self.canonical_cat_url(url) for url in data.get('failed_urls', [])}
+            self.save_progress()
+            logging.info(f"Imported progress from {self.progress_file}: {len(self.scraped_cats)} cats scraped, {len(self.discovered_urls)} URLs discovered")
         else:
             logging.info("Starting fresh discovery session")
     
     def save_progress(self):
-        """Save progress to file"""
-        data = {
-            'scraped_cats': list(self.scraped_cats),
-            'discovered_urls': list(self.discovered_urls),
-            'failed_urls': list(self.failed_urls),
-            'timestamp': datetime.now().isoformat()
-        }
-        with open(self.progress_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Save progress, inserting only entries added since the last save"""
+        with self.db, self.progress_lock:
+            for table in PROGRESS_TABLES:
+                new_values = getattr(self, table) - self.saved_progress[table]
+                if new_values:
+                    self.db.executemany(
+                        f'INSERT OR IGNORE INTO {table} (value) VALUES (?)',
+                        ((value,) for value in new_values)
+                    )
+                    self.saved_progress[table] |= new_values
+            self.db.execute(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                ('timestamp', datetime.now().isoformat())
+            )
+    
+    def canonical_cat_url(self, url):
+        """Normalize a cat profile link so each cat ID is queued only once"""
+        # Relative, absolute and www/non-www links to the same profile all
+        # collapse to one absolute URL keyed by the cat ID
+        cat_id_match = FOSTER_URL_PATTERN.search(url)
+        if cat_id_match:
+            return f"{self.base_url}/foster/{cat_id_match.group(1)}/"
+        return self.absolute_url(url)
+    
+    def absolute_url(self, href):
+        """Resolve a link against base_url, skipping urljoin for root-relative paths"""
+        if href.startswith('/') and not href.startswith('//'):
+            return self.base_origin + href
+        return urljoin(self.base_url, href)
     
     def get_existing_cat_ids(self):
         """Get list of already scraped cat IDs"""
@@ -89,7 +212,9 @@ class SmartCatDiscovery:
         for cat_info in api_cats:
             cat_id = str(cat_info.get('cat_id'))
             if cat_id not in self.scraped_cats:
-                self.discovered_urls.add(f"/foster/{cat_id}/")
+                cat_url = self.canonical_cat_url(f"/foster/{cat_id}/")
+                self.discovered_urls.add(cat_url)
+                self.confirmed_urls.add(cat_url)
         
         # Method 2: Explore existing cat pages for related cats
         existing_ids = self.get_existing_cat_ids()
@@ -130,27 +255,21 @@ class SmartCatDiscovery:
         url = f"{self.base_url}/foster/{cat_id}/"
         
         try:
-            response = self.session.get(url, timeout=10)
+            # Pages served from the cache don't touch the server, so they skip the wait
+            if not is_cached(self.page_session, url):
+                self.rate_limiter.acquire(url)
+            response = self.page_session.get(url, timeout=10)
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for links to other foster pages
-                links = soup.find_all('a', href=re.compile(r'/foster/\d+/'))
-                for link in links:
-                    href = link.get('href')
-                    if href and href not in self.discovered_urls:
-                        self.discovered_urls.add(href)
-                        logging.info(f"Found new cat link: {href}")
+                tree = lxml_html.fromstring(response.content)
                 
-                # Look for "related cats" or "similar cats" sections
-                related_sections = soup.find_all(['div', 'section'], class_=re.compile(r'related|similar|recommend'))
-                for section in related_sections:
-                    links = section.find_all('a', href=re.compile(r'/foster/\d+/'))
-                    for link in links:
-                        href = link.get('href')
-                        if href and href not in self.discovered_urls:
-                            self.discovered_urls.add(href)
-                            logging.info(f"Found related cat: {href}")
+                # Look for links to other foster pages (this already covers
+                # any "related"/"similar" cat sections on the page)
+                for href in tree.xpath(FOSTER_LINK_XPATH, namespaces=XPATH_NAMESPACES):
+                    cat_url = self.canonical_cat_url(href)
+                    self.confirmed_urls.add(cat_url)
+                    if cat_url not in self.discovered_urls:
+                        self.discovered_urls.add(cat_url)
+                        logging.info(f"Found new cat link: {cat_url}")
         
         except Exception as e:
             logging.error(f"Error exploring cat {cat_id}: {e}")
@@ -175,17 +294,20 @@ class SmartCatDiscovery:
     def scrape_cat_profile(self, url):
         """Scrape a single cat profile"""
         try:
-            response = self.session.get(url, timeout=10)
+            # Pages served from the cache don't touch the server, so they skip the wait
+            if not is_cached(self.page_session, url):
+                self.rate_limiter.acquire(url)
+            response = self.page_session.get(url, timeout=10)
             if response.status_code != 200:
-                self.failed_urls.add(url)
+                self.mark_failed(url)
                 return False
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             
             # Extract cat ID from URL
-            cat_id_match = re.search(r'/foster/(\d+)/', url)
+            cat_id_match = FOSTER_URL_PATTERN.search(url)
             if not cat_id_match:
-                self.failed_urls.add(url)
+                self.mark_failed(url)
                 return False
             
             cat_id = cat_id_match.group(1)
@@ -196,25 +318,34 @@ class SmartCatDiscovery:
             # Extract cat information
             cat_info = self.extract_cat_info(soup, cat_id)
             if not cat_info:
-                self.failed_urls.add(url)
+                self.mark_failed(url)
                 return False
             
-            # Download images
-            images_downloaded = self.download_cat_images(cat_info, cat_id)
+            # Download images (reusing the already-parsed profile page)
+            images_downloaded, image_srcs = self.download_cat_images(soup, cat_id)
             
             # Save cat info
             self.save_cat_info(cat_info, cat_id)
             
-            self.scraped_cats.add(cat_id)
+            # Only now does the cat appear under its cat_<id> directory
+            self.publish_cat_dir(cat_id, image_srcs)
+            
+            with self.progress_lock:
+                self.scraped_cats.add(cat_id)
             logging.info(f"Successfully scraped cat {cat_id} with {images_downloaded} images")
             
             return True
             
         except Exception as e:
             logging.error(f"Error scraping {url}: {e}")
-            self.failed_urls.add(url)
+            self.mark_failed(url)
             return False
     
+    def mark_failed(self, url):
+        """Record a profile URL that could not be scraped"""
+        with self.progress_lock:
+            self.failed_urls.add(url)
+    
     def extract_cat_info(self, soup, cat_id):
         """Extract cat information from the page"""
         try:
@@ -224,18 +355,28 @@ class SmartCatDiscovery:
                 'scraped_at': datetime.now().isoformat()
             }
             
+            # Walk the classed candidate tags once, picking out the first name and
+            # description and every detail in document order
+            name_elem = desc_elem = None
+            details = []
+            for tag in soup.find_all(PROFILE_TAGS, class_=True):
+                classes = ' '.join(tag.get('class'))
+                if name_elem is None and tag.name in NAME_TAGS and NAME_CLASS_PATTERN.search(classes):
+                    name_elem = tag
+                if desc_elem is None and tag.name in DESCRIPTION_TAGS and DESCRIPTION_CLASS_PATTERN.search(classes):
+                    desc_elem = tag
+                if tag.name in DETAIL_TAGS and DETAIL_CLASS_PATTERN.search(classes):
+                    details.append(tag)
+            
             # Extract name
-            name_elem = soup.find(['h1', 'h2', 'h3'], class_=re.compile(r'title|name'))
             if name_elem:
                 cat_info['name'] = name_elem.get_text(strip=True)
             
             # Extract description
-            desc_elem = soup.find(['div', 'p'], class_=re.compile(r'description|desc|content'))
             if desc_elem:
                 cat_info['description'] = desc_elem.get_text(strip=True)
             
             # Extract other details
-            details = soup.find_all(['div', 'span'], class_=re.compile(r'detail|info|attribute'))
             for detail in details:
                 text = detail.get_text(strip=True)
                 if ':' in text:
@@ -248,46 +389,119 @@ class SmartCatDiscovery:
             logging.error(f"Error extracting cat info: {e}")
             return None
     
-    def download_cat_images(self, cat_info, cat_id):
-        """Download images for a cat"""
+    def get_staging_dir(self, cat_id):
+        """Directory a cat's files are written to before it is published"""
+        # Hidden and not prefixed with 'cat_', so half-scraped cats are never
+        # picked up by get_existing_cat_ids or the cleaning/YOLO scripts
+        return self.output_dir / f".partial_cat_{cat_id}"
+    
+    def publish_cat_dir(self, cat_id, image_srcs):
+        """Move a fully scraped cat from its staging directory into place"""
+        staging_dir = self.get_staging_dir(cat_id)
         cat_dir = self.output_dir / f"cat_{cat_id}"
-        cat_dir.mkdir(exist_ok=True)
         
-        images_downloaded = 0
+        if cat_dir.exists():
+            # Merge into a directory left by another scraper
+            for item in staging_dir.iterdir():
+                os.replace(item, cat_dir / item.name)
+            staging_dir.rmdir()
+        else:
+            os.replace(staging_dir, cat_dir)
+        
+        # Keep reusable image paths pointing at the published copies; only this
+        # cat's own images can point into its staging directory
+        with self.downloaded_images_lock:
+            for src in image_srcs:
+                path = self.downloaded_images.get(src)
+                if path is not None and path.parent == staging_dir:
+                    self.downloaded_images[src] = cat_dir / path.name
+    
+    def download_cat_images(self, soup, cat_id):
+        """Download images for a cat, returning the count saved and the image URLs fetched"""
+        cat_dir = self.get_staging_dir(cat_id)
+        cat_dir.mkdir(exist_ok=True)
         
         # Find all images on the page
-        soup = BeautifulSoup(requests.get(cat_info['url']).content, 'html.parser')
-        images = soup.find_all('img', src=re.compile(r'\.(jpg|jpeg|png|gif)'))
+        images = soup.find_all('img', src=IMAGE_SRC_PATTERN)
         
-        for i, img in enumerate(images):
+        # One directory listing instead of a stat per image when resuming; a
+        # leftover .part file was cut off by a killed run, so drop it and refetch
+        existing_files = set()
+        for name in os.listdir(cat_dir):
+            if name.endswith('.part'):
+                (cat_dir / name).unlink(missing_ok=True)
+            else:
+                existing_files.add(name)
+        images_downloaded = 0
+        
+        downloads = []
+        seen_srcs = set()  # The same photo is often linked from several <img> tags
+        for img in images:
             src = img.get('src')
             if src:
                 if not src.startswith('http'):
-                    src = urljoin(self.base_url, src)
+                    src = self.absolute_url(src)
+                if src in seen_srcs:
+                    continue
+                seen_srcs.add(src)
                 
-                try:
-                    response = self.session.get(src, timeout=10)
-                    if response.status_code == 200:
-                        ext = src.split('.')[-1].lower()
-                        if ext not in ['jpg', 'jpeg', 'png', 'gif']:
-                            ext = 'jpg'
-                        
-                        filename = f"image_{i+1:03d}.{ext}"
-                        filepath = cat_dir / filename
-                        
-                        with open(filepath, 'wb') as f:
-                            f.write(response.content)
-                        
-                        images_downloaded += 1
+                ext = src.split('.')[-1].lower()
+                if ext not in IMAGE_EXTENSIONS:
+                    ext = 'jpg'
                 
-                except Exception as e:
-                    logging.error(f"Error downloading image {src}: {e}")
+                filename = f"image_{len(seen_srcs):03d}.{ext}"
+                if filename in existing_files:
+                    # Already downloaded by an interrupted earlier run
+                    images_downloaded += 1
+                    continue
+                downloads.append((src, cat_dir / filename))
+        
+        # Images are independent, so overlap their network waits
+        with ThreadPoolExecutor(max_workers=self.image_workers) as executor:
+            results = executor.map(lambda download: self.download_image(*download), downloads)
+            images_downloaded += sum(results)
+        
+        return images_downloaded, [src for src, _ in downloads]
+    
+    def download_image(self, src, filepath):
+        """Download a single image, returning True on success"""
+        with self.downloaded_images_lock:
+            existing_path = self.downloaded_images.get(src)
+        if existing_path and link_image(existing_path, filepath):
+            return True
+        
+        # Written under a temporary name and renamed into place only once the whole
+        # body has arrived, so a failed transfer never leaves a truncated or
+        # zero-padded file that a resumed run would take as complete
+        part_path = filepath.with_name(filepath.name + '.part')
+        try:
+            self.rate_limiter.acquire(src)
+            with self.session.get(src, timeout=10, stream=True) as response:
+                if response.status_code == 200:
+                    # Stream to disk in 64KB chunks instead of buffering the whole image
+                    response.raw.decode_content = True
+                    with open(part_path, 'wb', buffering=65536) as f:
+                        # Reserve the full size up front when it is known (and not a
+                        # compressed transfer size) so the file is laid out in one go
+                        size = int(response.headers.get('Content-Length', 0) or 0)
+                        if size and 'Content-Encoding' not in response.headers and hasattr(os, 'posix_fallocate'):
+                            os.posix_fallocate(f.fileno(), 0, size)
+                        shutil.copyfileobj(response.raw, f, length=65536)
+                        f.truncate()
+                    os.replace(part_path, filepath)
+                    with self.downloaded_images_lock:
+                        self.downloaded_images[src] = filepath
+                    return True
+        
+        except Exception as e:
+            logging.error(f"Error downloading image {src}: {e}")
+            part_path.unlink(missing_ok=True)
         
-        return images_downloaded
+        return False
     
     def save_cat_info(self, cat_info, cat_id):
         """Save cat information to JSON file"""
-        cat_dir = self.output_dir / f"cat_{cat_id}"
+        cat_dir = self.get_staging_dir(cat_id)
         cat_dir.mkdir(exist_ok=True)
         
         info_file = cat_dir / 'info.json'
@@ -301,18 +515,41 @@ class SmartCatDiscovery:
         # Discover new cats
         self.discover_new_cats()
         
-        # Scrape discovered cats
-        for url in list(self.discovered_urls):
-            if len(self.scraped_cats) >= self.target_cats:
-                break
-            
-            if url not in self.failed_urls:
-                success = self.scrape_cat_profile(url)
-                if success:
-                    self.save_progress()
+        # Scrape discovered cats with several profile fetches in flight.
+        # Skip cats already scraped (without refetching their page) and try
+        # linked/API cats before the speculative ID-range guesses.
+        scraped_urls = {self.canonical_cat_url(f"/foster/{cat_id}/") for cat_id in self.scraped_cats}
+        pending_urls = [
+            url for url in self.discovered_urls
+            if url not in self.failed_urls and url not in scraped_urls
+        ]
+        pending_urls.sort(key=lambda url: url not in self.confirmed_urls)
+        
+        pending = iter(pending_urls)
+        in_flight = set()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while True:
+                    # Keep up to max_workers profiles in flight, but never more than
+                    # could still count towards the target, so the run stops exactly on it
+                    while (len(in_flight) < self.max_workers
+                           and len(self.scraped_cats) + len(in_flight) < self.target_cats):
+                        url = next(pending, None)
+                        if url is None:
+                            break
+                        in_flight.add(executor.submit(self.scrape_cat_profile, url))
+                    if not in_flight:
+                        break
                     
-                    # Random delay
-                    time.sleep(random.uniform(1, 3))
+                    # Record each cat as soon as it is published, so a killed run
+                    # never rescrapes a cat that is already in place
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future.result():
+                            self.save_progress()
+        finally:
+            # Keep whatever finished before an interrupt or error
+            self.save_progress()
         
         # Final statistics
         logging.info(f"\n=== DISCOVERY COMPLETE ===")
@@ -325,6 +562,26 @@ class SmartCatDiscovery:
         else:
             logging.info(f"Target not reached. Need {self.target_cats - len(self.scraped_cats)} more cats.")
 
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Smart cat discovery")
+    parser.add_argument("--target", type=int, default=100, help="Target number of cats to scrape")
+    parser.add_argument("--workers", type=int, default=4, help="Cat profiles to scrape concurrently")
+    parser.add_argument("--rate", type=float, default=2, help="Maximum requests per second")
+    parser.add_argument("--page-cache", help="SQLite file to cache profile pages in between runs")
+    
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be greater than 0")
+    
+    discovery = SmartCatDiscovery(target_cats=args.target, max_workers=args.workers,
+                                  page_cache=args.page_cache, requests_per_second=args.rate)
+    
+    try:
+        discovery.run()
+    except KeyboardInterrupt:
+        logging.info("Discovery interrupted by user")
+
 if __name__ == "__main__":
-    discovery = SmartCatDiscovery(target_cats=100)
-    discovery.run() 
\ No newline at end of file
+    main() 
\ No newline at end of file